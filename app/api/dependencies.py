@@ -1,14 +1,20 @@
-from fastapi import Depends, Request
+from fastapi import Request
 
+from app.llm.models.factory import ModelRegistry
 from app.services.task_manager import TaskManager
 from app.services.task_scheduler import TaskScheduler
 
 
-def get_task_manager(request: Request):
-    """Get the task manager from app state"""
-    return request.app.state.task_manager
+def get_task_manager(request: Request) -> TaskManager:
+    """Get the task manager bound to the request state"""
+    return request.state.task_manager
 
 
-def get_scheduler(request: Request, task_manager: TaskManager = Depends(get_task_manager)):
-    """Get the task scheduler from app state"""
-    return request.app.state.scheduler
+def get_scheduler(request: Request) -> TaskScheduler:
+    """Get the task scheduler bound to the request state"""
+    return request.state.scheduler
+
+
+def get_model_registry(request: Request) -> ModelRegistry:
+    """Get the model registry bound to the request state"""
+    return request.state.model_registry
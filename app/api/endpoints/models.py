@@ -1,17 +1,20 @@
-from fastapi import APIRouter, HTTPException, Body
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Body
 from typing import Dict, List, Any, Optional
 
+from app.api.dependencies import get_model_registry
 from app.llm.interface import LLMInterface
+from app.llm.models.factory import ModelRegistry
 
 router = APIRouter()
 
 
 @router.get("/")
-async def list_models():
+async def list_models(registry: ModelRegistry = Depends(get_model_registry)):
     """
     List all registered models and their status.
     """
-    return await LLMInterface.list_models()
+    return registry.list()
 
 
 @router.post("/load")
@@ -41,7 +44,9 @@ async def unload_model(model_name: str):
     
     - **model_name**: Name of the model to unload
     """
-    success = LLMInterface.unload_model(model_name)
+    # Unloading can block for hundreds of ms freeing weights, so run it
+    # off the event loop
+    success = await asyncio.to_thread(LLMInterface.unload_model, model_name)
     if not success:
         raise HTTPException(status_code=404, detail=f"Model {model_name} not found or already unloaded")
     return {"status": "success", "message": f"Model {model_name} unloaded"}
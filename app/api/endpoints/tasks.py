@@ -1,5 +1,8 @@
-import asyncio
-from fastapi import APIRouter, Depends, HTTPException
+import types
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import ORJSONResponse, Response
 
 from app.models.request import TaskListRequest
 from app.services.task_manager import TaskManager
@@ -8,37 +11,97 @@ from app.api.dependencies import get_task_manager
 router = APIRouter()
 
 
+class RawJSONResponse(Response):
+    """Response that ships pre-serialized JSON bytes without re-encoding"""
+    media_type = "application/json"
+
+    def render(self, content: bytes) -> bytes:
+        return content
+
+
+def _task_etag(task_id: str, status: str) -> str:
+    """ETag for a task's status payload; changes only when the status does"""
+    # Non-terminal payloads are identical poll to poll, so the status
+    # string is enough to detect "nothing changed"
+    return f'"{task_id}:{status}"'
+
+
 @router.get("/{task_id}")
 async def get_task_status(
     task_id: str,
+    http_request: Request,
+    wait: Optional[float] = None,
     task_manager: TaskManager = Depends(get_task_manager)
 ):
     """
     Get the status of a specific task.
-    
+
     - **task_id**: ID of the task to retrieve
+    - **wait**: Optionally block up to this many seconds for the task to
+      finish before responding (long-poll)
+
+    Sends an ETag derived from the task status; polls carrying a matching
+    If-None-Match get an empty 304 instead of the unchanged payload.
     """
     try:
+        if wait:
+            await task_manager.wait_for(task_id, timeout=wait)
+
+        etag = _task_etag(task_id, task_manager.get_task_state(task_id))
+        if http_request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+
+        # Finished tasks have their status payload serialized once at
+        # completion; ship those bytes directly with zero encode work
+        raw = await task_manager.get_task_status_bytes(task_id)
+        if raw is not None:
+            return RawJSONResponse(raw, headers={"ETag": etag})
+
         task_status = await task_manager.get_task_status(task_id)
 
-        # if the result contains any coroutines we need to await the
-        if task_status.get("status") == "completed" and task_status.get("result") is not None: 
-            result = task_status.get("result")
-            if asyncio.iscoroutine(result):
-                try:
-                    task_status["result"] = await result
-                except RuntimeError as e:
-                    if "cannot reuse already await coroutine" in str(e):
-                        pass
-                    else:
-                        raise
-                except Exception as e:
-                    task_status["result"] = {"error": f"Error in task execution: {str(e)}"}
-                    task_status["status"] = "failed"
-
-        return task_status
+        # If the stored result is still a coroutine, resolve it once and write
+        # it back so later polls are plain dict lookups
+        result = task_status.get("result")
+        if task_status.get("status") == "completed" and isinstance(result, types.CoroutineType):
+            try:
+                resolved = await result
+                task_status["result"] = resolved
+                await task_manager.update_task_status(task_id, "completed", resolved)
+            except Exception as e:
+                task_status["result"] = {"error": f"Error in task execution: {str(e)}"}
+                task_status["status"] = "failed"
+                await task_manager.update_task_status(task_id, "failed", task_status["result"])
+
+        # Recompute from the payload: resolving the coroutine above may
+        # have moved the task to a terminal status
+        etag = _task_etag(task_id, task_status["status"])
+        return ORJSONResponse(task_status, headers={"ETag": etag})
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Task {task_id} not found")
+
+
+@router.get("/{task_id}/wait")
+async def wait_task_status(
+    task_id: str,
+    http_request: Request,
+    timeout: float = 30.0,
+    task_manager: TaskManager = Depends(get_task_manager)
+):
+    """
+    Long-poll for a task's terminal status.
+
+    Blocks until the task completes or fails, or until the timeout
+    elapses, then returns the same payload as the status endpoint —
+    saving clients a polling loop.
+
+    - **task_id**: ID of the task to wait for
+    - **timeout**: Maximum seconds to block before returning current status
+    """
+    try:
+        await task_manager.wait_for(task_id, timeout=timeout)
     except KeyError:
         raise HTTPException(status_code=404, detail=f"Task {task_id} not found")
+    return await get_task_status(task_id, http_request, None, task_manager)
 
 
 @router.get("/")
@@ -48,11 +111,25 @@ async def list_tasks(
 ):
     """
     List tasks with optional filtering.
-    
+
     - **status**: Filter by task status (optional)
     - **limit**: Maximum number of tasks to return
     - **skip**: Number of tasks to skip
+    - **ids**: Comma-separated task IDs; returns just those tasks so a
+      client polling N tasks makes one request instead of N
     """
+    if request.ids:
+        statuses = []
+        for task_id in request.ids.split(","):
+            task_id = task_id.strip()
+            if not task_id:
+                continue
+            try:
+                statuses.append(await task_manager.get_task_status(task_id))
+            except KeyError:
+                statuses.append({"id": task_id, "status": "not_found"})
+        return statuses
+
     tasks = await task_manager.list_tasks(
         status=request.status,
         limit=request.limit,
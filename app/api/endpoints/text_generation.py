@@ -1,16 +1,76 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Any, Dict, List, Optional
 
-from app.models.request import TextGenerationRequest
+from fastapi import APIRouter, Depends, HTTPException, Request
+
+from app.models.request import TextGenerationRequest, TextGenerationBatchRequest
 from app.models.response import TaskResponse
 from app.services.task_scheduler import TaskScheduler
 from app.api.dependencies import get_scheduler
 
+try:
+    import msgspec
+
+    class _TextGenerationBody(msgspec.Struct):
+        """msgspec twin of TextGenerationRequest for fast request decoding"""
+        prompt: str
+        model_name: Optional[str] = None
+        params: Optional[Dict[str, Any]] = None
+
+    class _TextGenerationBatchBody(msgspec.Struct):
+        """msgspec twin of TextGenerationBatchRequest"""
+        items: List[_TextGenerationBody]
+
+    _decoder = msgspec.json.Decoder(_TextGenerationBody)
+    _batch_decoder = msgspec.json.Decoder(_TextGenerationBatchBody)
+
+    def _decode_body(body: bytes):
+        try:
+            return _decoder.decode(body)
+        except msgspec.ValidationError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        except msgspec.DecodeError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+
+    def _decode_batch_body(body: bytes):
+        try:
+            return _batch_decoder.decode(body)
+        except msgspec.ValidationError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        except msgspec.DecodeError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+except ImportError:
+    def _decode_body(body: bytes):
+        try:
+            return TextGenerationRequest.model_validate_json(body)
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+
+    def _decode_batch_body(body: bytes):
+        try:
+            return TextGenerationBatchRequest.model_validate_json(body)
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+
 router = APIRouter()
 
 
-@router.post("/generate", response_model=TaskResponse)
+# The body is decoded with msgspec's Rust-backed validator instead of a
+# pydantic model parameter; the pydantic schema still documents the route
+@router.post(
+    "/generate",
+    response_model=None,
+    responses={200: {"model": TaskResponse}},
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": TextGenerationRequest.model_json_schema()}
+            },
+        }
+    },
+)
 async def generate_text(
-    request: TextGenerationRequest,
+    http_request: Request,
     scheduler: TaskScheduler = Depends(get_scheduler)
 ):
     """
@@ -19,7 +79,44 @@ async def generate_text(
     The task will be processed asynchronously, and the result can be retrieved
     using the returned task ID.
     """
+    request = _decode_body(await http_request.body())
     task_id = await scheduler.schedule_text_generation(
         request.prompt, request.model_name, request.params
     )
     return {"task_id": task_id}
+
+
+@router.post(
+    "/generate/batch",
+    response_model=None,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": TextGenerationBatchRequest.model_json_schema()
+                }
+            },
+        }
+    },
+)
+async def generate_text_batch(
+    http_request: Request,
+    scheduler: TaskScheduler = Depends(get_scheduler)
+):
+    """
+    Schedule several text generation tasks in one request.
+
+    Submitting N prompts separately costs N round trips; this endpoint
+    accepts them all at once and returns the task IDs in order. The
+    scheduler's batching window then naturally groups them for batched
+    inference.
+    """
+    request = _decode_batch_body(await http_request.body())
+    task_ids = [
+        await scheduler.schedule_text_generation(
+            item.prompt, item.model_name, item.params
+        )
+        for item in request.items
+    ]
+    return {"task_ids": task_ids}
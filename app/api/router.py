@@ -1,4 +1,5 @@
 from fastapi import APIRouter
+from fastapi.responses import ORJSONResponse
 
 from app.api.endpoints import health, text_generation, chat_completion, tasks, models
 from app.core.config import get_settings
@@ -6,7 +7,9 @@ from app.core.config import get_settings
 settings = get_settings()
 
 # Create the main API router
-api_router = APIRouter(prefix=settings.API_V1_PREFIX)
+# ORJSONResponse serializes responses with orjson's C encoder, which is
+# several times faster than stdlib json for the task/model list payloads
+api_router = APIRouter(prefix=settings.API_V1_PREFIX, default_response_class=ORJSONResponse)
 
 # Include all endpoint routers
 api_router.include_router(health.router, prefix="/health", tags=["health"])
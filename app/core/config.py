@@ -24,7 +24,15 @@ class Settings(BaseSettings):
     
     # LLM settings
     DEFAULT_MODEL_NAME: str = "default-model"
+    PRELOAD_MODELS: List[str] = []
+    # Point at a tmpfs mount (e.g. /dev/shm/crebai-models) so repeated
+    # loads mmap weights from the page cache instead of cold storage
     MODEL_CACHE_DIR: Optional[str] = None
+    BATCH_MAX_SIZE: int = 8
+    BATCH_WINDOW_MS: int = 5
+    MAX_CONCURRENT_LOADS: int = 2
+    MAX_CONCURRENT_INFERENCE: int = 2
+    MODEL_CACHE_MAX_SIZE: int = 4
     
     # Task manager settings
     TASK_CLEANUP_INTERVAL_HOURS: int = 24
@@ -1,5 +1,6 @@
 import os
 import yaml
+from functools import lru_cache
 from typing import Dict, Any, List, Optional
 from pathlib import Path
 
@@ -8,26 +9,41 @@ from app.core.logging import get_logger
 logger = get_logger(__name__)
 
 
+@lru_cache(maxsize=8)
+def _load_yaml_cached(file_path: str, mtime: float) -> Dict[str, Any]:
+    """Parse a YAML file, cached on (path, mtime) so edits invalidate"""
+    try:
+        with open(file_path, 'r') as file:
+            config = yaml.safe_load(file)
+        logger.info(f"Loaded configuration from {file_path}")
+        return config or {}
+    except Exception as e:
+        logger.error(f"Error loading config from {file_path}: {str(e)}")
+        return {}
+
+
 def load_yaml_config(file_path: str) -> Dict[str, Any]:
     """
     Load configuration from a YAML file.
-    
+
+    Results are cached against the file's mtime, so repeated calls cost
+    one os.stat instead of an open and parse.
+
     Args:
         file_path: Path to the YAML config file
-        
+
     Returns:
         Dictionary with configuration values
     """
     try:
-        with open(file_path, 'r') as file:
-            config = yaml.safe_load(file)
-        logger.info(f"Loaded configuration from {file_path}")
-        return config or {}
-    except Exception as e:
+        mtime = os.path.getmtime(file_path)
+    except OSError as e:
         logger.error(f"Error loading config from {file_path}: {str(e)}")
         return {}
+    return _load_yaml_cached(file_path, mtime)
 
 
+@lru_cache(maxsize=1)
 def get_config_path() -> str:
     """
     Get the path to the configuration file.
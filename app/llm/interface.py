@@ -6,44 +6,108 @@ import os
 
 from app.core.logging import get_logger
 from app.core.config import get_settings
-from app.llm.models.factory import create_model, get_model, register_model
+from app.llm.models.factory import create_model, get_model, register_model, get_default_registry
 
 settings = get_settings()
 logger = get_logger(__name__)
 
+# Per-model locks de-duplicate concurrent loads of the same weights;
+# the semaphore caps how many loads run at once to respect device memory
+_LOAD_LOCKS: Dict[str, asyncio.Lock] = {}
+_LOAD_SEM = asyncio.Semaphore(settings.MAX_CONCURRENT_LOADS)
+
 
 class LLMInterface:
     """Interface for LLM operations using MLX models"""
-    
+
+    @classmethod
+    async def _load_guarded(cls, model) -> Any:
+        """
+        Load a model under the per-name lock and global load semaphore.
+
+        Re-checks the registry after acquiring the lock so concurrent
+        callers racing to load the same model share one load.
+
+        Args:
+            model: Model instance to load
+
+        Returns:
+            The loaded model instance (possibly a registered duplicate)
+        """
+        lock = _LOAD_LOCKS.setdefault(model.name, asyncio.Lock())
+        # Per-name lock first: callers queued behind a load of the same
+        # model must not hold semaphore slots, or they'd starve loads of
+        # other models. Only the caller actually about to load takes a slot
+        async with lock:
+            registered = get_model(model.name)
+            if registered is not None and registered.is_loaded:
+                return registered
+            async with _LOAD_SEM:
+                await model.load()
+            get_default_registry().invalidate_snapshot()
+            return model
+
+    @classmethod
+    async def _ensure_loaded(cls, model_name: str, params: Dict):
+        """
+        Get a model by name, creating and loading it if necessary.
+
+        Args:
+            model_name: Name of the model
+            params: Generation parameters (may carry a model_path override)
+
+        Returns:
+            A loaded model instance
+        """
+        model = get_model(model_name)
+        if model is not None and model.is_loaded:
+            return model
+
+        if model is None:
+            # Default to MLX model if not specified
+            model_path = params.get("model_path", model_name)
+            model = create_model("mlx", model_name, model_path)
+            register_model(model)
+
+        return await cls._load_guarded(model)
+
     @classmethod
     async def load_model(cls, model_name: str, model_type: str = "mlx", model_path: Optional[str] = None) -> Dict[str, Any]:
         """
         Load a model into memory.
-        
+
         Args:
             model_name: Name or identifier for the model
             model_type: Type of model backend to use
             model_path: Optional path or HF repo ID for the model
-            
+
         Returns:
             Dict containing model info
         """
-        logger.info(f"Loading model: {model_name} (type: {model_type})")
-        
-        # Check if model is already loaded
-        model = get_model(model_name)
-        if model and model.is_loaded:
-            logger.info(f"Model {model_name} already loaded")
-            return {"name": model_name, "loaded": True, "cached": True}
-        
-        # Create and load the model
-        if not model:
-            model = create_model(model_type, model_name, model_path)
-            register_model(model)
-        
-        # Load the model
-        result = await model.load()
-        return result
+        logger.info("Loading model: %s (type: %s)", model_name, model_type)
+
+        lock = _LOAD_LOCKS.setdefault(model_name, asyncio.Lock())
+        # Per-name lock first, semaphore only around the load itself:
+        # waiters de-duplicating on one model shouldn't consume the slots
+        # that cap genuinely concurrent loads
+        async with lock:
+            # Re-check after acquiring the lock: a concurrent load may have
+            # finished while we waited
+            model = get_model(model_name)
+            if model and model.is_loaded:
+                logger.info("Model %s already loaded", model_name)
+                return {"name": model_name, "loaded": True, "cached": True}
+
+            # Create and load the model
+            if not model:
+                model = create_model(model_type, model_name, model_path)
+                register_model(model)
+
+            # Load the model
+            async with _LOAD_SEM:
+                result = await model.load()
+            get_default_registry().invalidate_snapshot()
+            return result
     
     @classmethod
     async def generate_text(cls, prompt: str, model_name: Optional[str] = None, params: Optional[Dict] = None) -> str:
@@ -63,19 +127,11 @@ class LLMInterface:
             from app.core.config_loader import get_default_model
             model_name = get_default_model() or "mlx-community/Llama-3.2-3B-Instruct-4bit"
 
-        logger.info(f"Generating text with model {model_name}")
+        logger.debug("Generating text with model %s", model_name)
         params = params or {}
         
         # Get the model (load if necessary)
-        model = get_model(model_name)
-        if not model:
-            # Default to MLX model if not specified
-            model_path = params.get("model_path", model_name)
-            model = create_model("mlx", model_name, model_path)
-            register_model(model)
-            await model.load()
-        elif not model.is_loaded:
-            await model.load()
+        model = await cls._ensure_loaded(model_name, params)
         
         # Generate text
         return await model.generate(prompt, params)
@@ -93,23 +149,63 @@ class LLMInterface:
         Returns:
             Chat completion response
         """
-        logger.info(f"Generating chat completion with model {model_name}")
+        logger.debug("Generating chat completion with model %s", model_name)
         params = params or {}
         
         # Get the model (load if necessary)
-        model = get_model(model_name)
-        if not model:
-            # Default to MLX model if not specified
-            model_path = params.get("model_path", model_name)
-            model = create_model("mlx", model_name, model_path)
-            register_model(model)
-            await model.load()
-        elif not model.is_loaded:
-            await model.load()
+        model = await cls._ensure_loaded(model_name, params)
         
         # Generate chat completion
         return await model.chat(messages, params)
 
+    @classmethod
+    async def batch_generate_text(cls, prompts: List[str], model_name: str, params: Optional[Dict] = None) -> List[str]:
+        """
+        Generate text for a batch of prompts using the specified model.
+
+        Args:
+            prompts: List of input text prompts
+            model_name: Name of the model to use
+            params: Generation parameters shared by the batch
+
+        Returns:
+            List of generated texts, one per prompt
+        """
+        logger.debug("Generating text batch of %d with model %s", len(prompts), model_name)
+        params = params or {}
+
+        # Get the model (load if necessary)
+        model = await cls._ensure_loaded(model_name, params)
+
+        # Use the model's batch path if it has one, otherwise loop
+        if hasattr(model, "batch_generate"):
+            return await model.batch_generate(prompts, params)
+        return [await model.generate(prompt, params) for prompt in prompts]
+
+    @classmethod
+    async def batch_chat_completion(cls, messages_list: List[List[Dict]], model_name: str, params: Optional[Dict] = None) -> List[Dict]:
+        """
+        Generate chat completions for a batch of conversations.
+
+        Args:
+            messages_list: List of conversations, each a list of chat messages
+            model_name: Name of the model to use
+            params: Generation parameters shared by the batch
+
+        Returns:
+            List of chat completion responses, one per conversation
+        """
+        logger.debug("Generating chat batch of %d with model %s", len(messages_list), model_name)
+        params = params or {}
+
+        # Get the model (load if necessary)
+        model = await cls._ensure_loaded(model_name, params)
+
+        # Use the model's batch path if it has one, otherwise loop
+        if hasattr(model, "batch_chat"):
+            return await model.batch_chat(messages_list, params)
+        return [await model.chat(messages, params) for messages in messages_list]
+
     @classmethod
     async def stream_chat_completion(cls, messages: List[Dict], model_name: str, params: Optional[Dict] = None) -> AsyncGenerator[Dict, None]:
         """
@@ -123,21 +219,13 @@ class LLMInterface:
         Returns:
             Chat completion response
         """
-        logger.info(f"Generating chat completion with model {model_name}")
+        logger.debug("Generating chat completion with model %s", model_name)
         params = params or {}
 
         stream_params = {**params, "stream": True}
         
         # Get the model (load if necessary)
-        model = get_model(model_name)
-        if not model:
-            # Default to MLX model if not specified
-            model_path = params.get("model_path", model_name)
-            model = create_model("mlx", model_name, model_path)
-            register_model(model)
-            await model.load()
-        elif not model.is_loaded:
-            await model.load()
+        model = await cls._ensure_loaded(model_name, params)
 
         if not hasattr(model, "chat_stream"):
             raise NotImplementedError(f"Model {model_name} does not support streaming")
@@ -159,8 +247,10 @@ class LLMInterface:
         """
         model = get_model(model_name)
         if model:
-            logger.info(f"Unloading model: {model_name}")
-            return model.unload()
+            logger.info("Unloading model: %s", model_name)
+            result = model.unload()
+            get_default_registry().invalidate_snapshot()
+            return result
         return False
     
     @classmethod
@@ -171,14 +261,6 @@ class LLMInterface:
         Returns:
             List of model information dictionaries
         """
-        from app.llm.models.factory import _LOADED_MODELS
-        
-        models_info = []
-        for name, model in _LOADED_MODELS.items():
-            models_info.append({
-                "name": name,
-                "type": model.__class__.__name__,
-                "loaded": model.is_loaded
-            })
-        
-        return models_info
+        from app.llm.models.factory import get_default_registry
+
+        return get_default_registry().list()
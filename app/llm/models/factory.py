@@ -1,10 +1,14 @@
-from typing import Dict, Optional
+import asyncio
 
+from typing import Any, Dict, List, Optional, Set
+
+from app.core.config import get_settings
 from app.core.logging import get_logger
 from app.llm.models.base import BaseLLMModel
 from app.llm.models.mlx_model import MLXModel
 
 logger = get_logger(__name__)
+settings = get_settings()
 
 
 # Registry of available model backends
@@ -12,83 +16,228 @@ _MODEL_REGISTRY = {
     "mlx": MLXModel,
 }
 
-# Cache of loaded models
-_LOADED_MODELS: Dict[str, BaseLLMModel] = {}
+
+class ModelRegistry:
+    """Registry of loaded model instances"""
+
+    def __init__(self, max_size: Optional[int] = None):
+        self._models: Dict[str, BaseLLMModel] = {}
+        # Snapshot returned by list(); rebuilt only when membership or
+        # load state changes instead of on every call
+        self._snapshot: List[Dict[str, Any]] = []
+        # LRU bound on resident models; pinned names are never evicted
+        self._max_size = max_size or settings.MODEL_CACHE_MAX_SIZE
+        self._pinned: Set[str] = set()
+
+    def get(self, model_name: str) -> Optional[BaseLLMModel]:
+        """
+        Get a model from the registry or return None if not found.
+
+        Args:
+            model_name: Name of the model to retrieve
+
+        Returns:
+            Model instance or None if not found
+        """
+        model = self._models.get(model_name)
+        if model is not None:
+            # Refresh recency so the LRU evicts genuinely cold models
+            self._models[model_name] = self._models.pop(model_name)
+        return model
+
+    def pin(self, model_name: str) -> None:
+        """
+        Pin a model so the LRU policy never evicts it.
+
+        Args:
+            model_name: Name of the model to pin
+        """
+        self._pinned.add(model_name)
+        logger.info(f"Pinned model in cache: {model_name}")
+
+    def _evict_if_full(self) -> None:
+        """Evict the least recently used unpinned model when over capacity"""
+        while len(self._models) > self._max_size:
+            victim = next(
+                (name for name in self._models if name not in self._pinned),
+                None
+            )
+            if victim is None:
+                # Everything resident is pinned; growing past max_size is
+                # better than evicting a model we promised to keep warm
+                logger.warning(
+                    f"Model cache over capacity ({len(self._models)}/{self._max_size}) "
+                    "but all entries are pinned; not evicting"
+                )
+                return
+            model = self._models.pop(victim)
+            if model.is_loaded:
+                self._unload_off_loop(model)
+            logger.info(f"Evicted model from cache: {victim}")
+
+    @staticmethod
+    def _unload_off_loop(model: BaseLLMModel) -> None:
+        """
+        Unload an evicted model without blocking the event loop.
+
+        unload() runs gc plus Metal cache teardown — hundreds of ms —
+        and eviction happens inside register() on the request path, so
+        the work goes to a worker thread when a loop is running.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            model.unload()
+            return
+        loop.run_in_executor(None, model.unload)
+
+    def register(self, model: BaseLLMModel) -> None:
+        """
+        Register a model in the registry.
+
+        Args:
+            model: Model instance to register
+        """
+        self._models[model.name] = model
+        self._evict_if_full()
+        self._rebuild_snapshot()
+        logger.info(f"Registered model in cache: {model.name}")
+
+    def unregister(self, model_name: str) -> bool:
+        """
+        Remove a model from the registry.
+
+        Args:
+            model_name: Name of the model to remove
+
+        Returns:
+            True if the model was removed, False otherwise
+        """
+        if model_name in self._models:
+            model = self._models.pop(model_name)
+            if model.is_loaded:
+                model.unload()
+            self._pinned.discard(model_name)
+            self._rebuild_snapshot()
+            logger.info(f"Unregistered model from cache: {model_name}")
+            return True
+        return False
+
+    def _rebuild_snapshot(self) -> None:
+        """Rebuild the cached model-info list"""
+        self._snapshot = [
+            {
+                "name": name,
+                "type": model.__class__.__name__,
+                "loaded": model.is_loaded
+            }
+            for name, model in self._models.items()
+        ]
+
+    def invalidate_snapshot(self) -> None:
+        """
+        Rebuild the snapshot after a model's load state changed.
+
+        Called by code that loads or unloads a registered model outside
+        of register/unregister.
+        """
+        self._rebuild_snapshot()
+
+    def list(self) -> List[Dict[str, Any]]:
+        """
+        List all registered models and their status.
+
+        Returns:
+            List of model information dictionaries
+        """
+        return self._snapshot
+
+
+# Default process-wide registry, shared with app.state.model_registry
+_DEFAULT_REGISTRY = ModelRegistry()
+
+
+def get_default_registry() -> ModelRegistry:
+    """Get the default process-wide model registry"""
+    return _DEFAULT_REGISTRY
 
 
 def create_model(
-    model_type: str, 
-    model_name: str, 
+    model_type: str,
+    model_name: str,
     model_path: Optional[str] = None,
     **kwargs
 ) -> BaseLLMModel:
     """
     Create a model instance of the specified type.
-    
+
     Args:
         model_type: Type of model backend (e.g., "mlx")
         model_name: Name identifier for the model
         model_path: Optional path or HF repo ID for the model
         **kwargs: Additional arguments for the model constructor
-        
+
     Returns:
         Instance of a BaseLLMModel
-        
+
     Raises:
         ValueError: If the model type is not supported
     """
     if model_type not in _MODEL_REGISTRY:
         supported = ", ".join(_MODEL_REGISTRY.keys())
         raise ValueError(f"Unsupported model type: {model_type}. Supported types: {supported}")
-    
+
     model_class = _MODEL_REGISTRY[model_type]
     return model_class(model_name, model_path, **kwargs)
 
 
 def get_model(model_name: str, load: bool = False) -> Optional[BaseLLMModel]:
     """
-    Get a model from the cache or return None if not found.
-    
+    Get a model from the default registry or return None if not found.
+
     Args:
         model_name: Name of the model to retrieve
         load: Whether to load the model if it's not loaded
-        
+
     Returns:
         Model instance or None if not found
     """
-    model = _LOADED_MODELS.get(model_name)
-    
+    model = _DEFAULT_REGISTRY.get(model_name)
+
     if model and load and not model.is_loaded:
         logger.info(f"Model {model_name} found in cache but not loaded, will load")
-    
+
     return model
 
 
+def pin_model(model_name: str) -> None:
+    """
+    Pin a model in the default registry so it is never evicted.
+
+    Args:
+        model_name: Name of the model to pin
+    """
+    _DEFAULT_REGISTRY.pin(model_name)
+
+
 def register_model(model: BaseLLMModel) -> None:
     """
-    Register a model in the cache.
-    
+    Register a model in the default registry.
+
     Args:
         model: Model instance to register
     """
-    _LOADED_MODELS[model.name] = model
-    logger.info(f"Registered model in cache: {model.name}")
+    _DEFAULT_REGISTRY.register(model)
 
 
 def unregister_model(model_name: str) -> bool:
     """
-    Remove a model from the cache.
-    
+    Remove a model from the default registry.
+
     Args:
         model_name: Name of the model to remove
-        
+
     Returns:
         True if the model was removed, False otherwise
     """
-    if model_name in _LOADED_MODELS:
-        model = _LOADED_MODELS.pop(model_name)
-        if model.is_loaded:
-            model.unload()
-        logger.info(f"Unregistered model from cache: {model_name}")
-        return True
-    return False
+    return _DEFAULT_REGISTRY.unregister(model_name)
@@ -0,0 +1,78 @@
+from collections import OrderedDict
+from typing import Dict, List
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class PrefixTokenCache:
+    """
+    Append-only tokenization cache for repeated chat prompt prefixes.
+
+    Multi-turn chats re-send the same system prompt and history every
+    turn, and re-running the BPE tokenizer over all of it is pure waste.
+    The cache stores token ids keyed by the rendered conversation text;
+    when a new conversation extends a cached one, only the new suffix is
+    tokenized. Chat templates delimit messages with special tokens, so
+    BPE merges don't cross the append boundary.
+    """
+
+    def __init__(self, tokenizer, max_entries: int = 8):
+        """
+        Initialize the cache.
+
+        Args:
+            tokenizer: Tokenizer with apply_chat_template/encode
+            max_entries: Maximum cached conversations (LRU eviction)
+        """
+        self._tokenizer = tokenizer
+        self._entries: "OrderedDict[str, List[int]]" = OrderedDict()
+        self._max_entries = max_entries
+
+    def encode_messages(self, messages: List[Dict]) -> List[int]:
+        """
+        Encode a conversation to token ids, reusing cached prefixes.
+
+        Args:
+            messages: List of chat messages
+
+        Returns:
+            Token ids for the templated conversation with generation prompt
+        """
+        body = self._tokenizer.apply_chat_template(
+            messages, tokenize=False, add_generation_prompt=False
+        )
+        body_tokens = self._encode_with_cache(body)
+
+        full = self._tokenizer.apply_chat_template(
+            messages, tokenize=False, add_generation_prompt=True
+        )
+        if full.startswith(body):
+            tail = self._tokenizer.encode(full[len(body):], add_special_tokens=False)
+            return body_tokens + tail
+
+        # Template doesn't render append-only; fall back to a full encode
+        return self._tokenizer.encode(full)
+
+    def _encode_with_cache(self, text: str) -> List[int]:
+        """Encode text, tokenizing only the part past the longest cached prefix"""
+        best_key = None
+        for key in self._entries:
+            if len(key) <= len(text) and text.startswith(key):
+                if best_key is None or len(key) > len(best_key):
+                    best_key = key
+
+        if best_key is not None:
+            suffix = self._tokenizer.encode(text[len(best_key):], add_special_tokens=False)
+            tokens = self._entries[best_key] + suffix
+            self._entries.move_to_end(best_key)
+        else:
+            tokens = self._tokenizer.encode(text)
+
+        self._entries[text] = tokens
+        self._entries.move_to_end(text)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+        return list(tokens)
@@ -1,10 +1,17 @@
 from contextlib import asynccontextmanager
+import asyncio
 import os
+import sys
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.api.router import api_router
+from app.core.config_loader import get_configured_models
+from app.llm.interface import LLMInterface
+from app.llm.models.factory import get_default_registry, get_model, pin_model
 from app.services.task_manager import TaskManager
 from app.services.task_scheduler import TaskScheduler
 from app.core.config import get_settings
@@ -26,25 +33,67 @@ async def lifespan(app: FastAPI):
     - Starts the scheduler
     - Stops the scheduler on shutdown
     """
+    # Use eager task execution on 3.12+ so coroutines that never suspend
+    # complete without an event-loop round trip
+    if sys.version_info >= (3, 12):
+        loop = asyncio.get_running_loop()
+        loop.set_task_factory(asyncio.eager_task_factory)
+
     # Initialize services
     logger.info("Initializing application services...")
     task_manager = TaskManager()
     scheduler = TaskScheduler(task_manager)
-    
+
     # Make them available to routes
     app.state.task_manager = task_manager
     app.state.scheduler = scheduler
+    app.state.model_registry = get_default_registry()
     
-    # Preload models if configured
-    # TODO: Add config for preloading models
-    
+    # Preload configured models so the first request doesn't pay the
+    # multi-second load or the first-token kernel warmup (load() warms up
+    # with a one-token generation). Sources: config.yaml entries flagged
+    # preload, plus the PRELOAD_MODELS setting
+    to_preload = [
+        (m["name"], m.get("type", "mlx"), m.get("path"), m.get("system_prompt"))
+        for m in get_configured_models()
+        if m.get("preload")
+    ]
+    configured_names = {name for name, _, _, _ in to_preload}
+    for name in settings.PRELOAD_MODELS:
+        if name not in configured_names:
+            to_preload.append((name, "mlx", None, None))
+
+    async def _preload(name, model_type, path, system_prompt):
+        try:
+            await LLMInterface.load_model(name, model_type, path)
+            # Preloaded models stay resident regardless of LRU pressure
+            pin_model(name)
+            # Prefill the configured system prompt's attention state so
+            # fresh conversations start from a warm KV cache
+            if system_prompt:
+                model = get_model(name)
+                if model is not None and hasattr(model, "set_system_prompt"):
+                    await model.set_system_prompt(system_prompt)
+        except Exception as e:
+            logger.error(f"Failed to preload model {name}: {str(e)}")
+
+    if to_preload:
+        # Concurrent, bounded by the interface's load semaphore
+        await asyncio.gather(*(_preload(*entry) for entry in to_preload))
+
+
     # Start the scheduler
     logger.info("Starting task scheduler...")
     await scheduler.start()
-    
-    # Yield control to FastAPI
-    yield
-    
+
+    # Yield the services as lifespan state; starlette copies this dict
+    # into each request scope, so dependencies read request.state directly
+    yield {
+        "task_manager": task_manager,
+        "scheduler": scheduler,
+        "model_registry": app.state.model_registry,
+    }
+
     # Shutdown tasks
     logger.info("Stopping task scheduler...")
     await scheduler.stop()
@@ -58,6 +107,9 @@ def create_application() -> FastAPI:
         description="FastAPI server for running LLM inference tasks asynchronously",
         version=settings.VERSION,
         lifespan=lifespan,
+        # Serialize every response through orjson's C encoder, including
+        # routes mounted outside the versioned API router
+        default_response_class=ORJSONResponse,
     )
     
     # Add CORS middleware
@@ -69,6 +121,10 @@ def create_application() -> FastAPI:
         allow_headers=settings.CORS_ALLOW_HEADERS,
     )
     
+    # Compress multi-KB JSON bodies (generated text compresses ~5-10x);
+    # small responses skip compression entirely
+    app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
     # Include API router
     app.include_router(api_router)
     
@@ -87,5 +143,10 @@ if __name__ == "__main__":
         "app.main:app",
         host=settings.HOST,
         port=settings.PORT,
-        reload=settings.DEBUG
+        reload=settings.DEBUG,
+        loop="uvloop",
+        http="httptools",
+        # Access logging formats and writes a line per request; keep it
+        # for debugging only
+        access_log=settings.DEBUG
     )
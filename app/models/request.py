@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Dict, List, Optional, Any
 
 
@@ -8,8 +8,9 @@ class TextGenerationRequest(BaseModel):
     model_name: Optional[str] = Field(None, description="Model to use for generation")
     params: Optional[Dict[str, Any]] = Field(None, description="Generation parameters")
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        protected_namespaces=(),
+        json_schema_extra={
             "example": {
                 "prompt": "Explain quantum computing in simple terms",
                 "model_name": "gpt2-xl",
@@ -19,7 +20,26 @@ class TextGenerationRequest(BaseModel):
                     "top_p": 0.9
                 }
             }
-        }
+        },
+    )
+
+
+class TextGenerationBatchRequest(BaseModel):
+    """Request model for the batched text generation endpoint"""
+    items: List[TextGenerationRequest] = Field(
+        ..., description="Generation requests to submit in one call"
+    )
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "items": [
+                    {"prompt": "Explain quantum computing in simple terms"},
+                    {"prompt": "Write a haiku about the sea"}
+                ]
+            }
+        },
+    )
 
 
 class ChatCompletionRequest(BaseModel):
@@ -31,8 +51,9 @@ class ChatCompletionRequest(BaseModel):
     model_name: Optional[str] = Field(None, description="Model to use for generation")
     params: Optional[Dict[str, Any]] = Field(None, description="Generation parameters")
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        protected_namespaces=(),
+        json_schema_extra={
             "example": {
                 "messages": [
                     {"role": "system", "content": "You are a helpful assistant."},
@@ -44,7 +65,8 @@ class ChatCompletionRequest(BaseModel):
                     "max_tokens": 500
                 }
             }
-        }
+        },
+    )
 
 class ChatCompletionChunk(BaseModel):
     """Single chunk of a streaming chat completion response"""
@@ -60,12 +82,16 @@ class TaskListRequest(BaseModel):
     status: Optional[str] = Field(None, description="Filter by task status")
     limit: int = Field(100, description="Maximum number of tasks to return")
     skip: int = Field(0, description="Number of tasks to skip")
+    ids: Optional[str] = Field(
+        None, description="Comma-separated task IDs to fetch in one call"
+    )
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "status": "completed",
                 "limit": 20,
                 "skip": 0
             }
-        }
+        },
+    )
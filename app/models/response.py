@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Dict, List, Optional, Any, Union
 from datetime import datetime
 
@@ -7,12 +7,13 @@ class TaskResponse(BaseModel):
     """Response model for task creation endpoints"""
     task_id: str = Field(..., description="ID of the created task")
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "task_id": "3fa85f64-5717-4562-b3fc-2c963f66afa6"
             }
-        }
+        },
+    )
 
 
 class HealthResponse(BaseModel):
@@ -21,14 +22,15 @@ class HealthResponse(BaseModel):
     service: str = Field(..., description="Service name")
     version: str = Field(..., description="Service version")
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "status": "healthy",
                 "service": "LLM Inference Server",
                 "version": "1.0.0"
             }
-        }
+        },
+    )
 
 
 class ModelResponse(BaseModel):
@@ -37,14 +39,15 @@ class ModelResponse(BaseModel):
     type: str = Field(..., description="Model type")
     loaded: bool = Field(..., description="Whether the model is loaded")
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "name": "Llama-3.2-3B-Instruct-4bit",
                 "type": "MLXModel",
                 "loaded": True
             }
-        }
+        },
+    )
 
 
 class ModelLoadResponse(BaseModel):
@@ -55,15 +58,16 @@ class ModelLoadResponse(BaseModel):
     load_time_seconds: Optional[float] = Field(None, description="Time taken to load the model")
     error: Optional[str] = Field(None, description="Error message if loading failed")
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "name": "Llama-3.2-3B-Instruct-4bit",
                 "loaded": True,
                 "cached": False,
                 "load_time_seconds": 5.23
             }
-        }
+        },
+    )
 
 
 class TaskStatusResponse(BaseModel):
@@ -76,8 +80,8 @@ class TaskStatusResponse(BaseModel):
     params: Dict = Field(..., description="Task parameters")
     result: Optional[Any] = Field(None, description="Task result if completed")
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "id": "3fa85f64-5717-4562-b3fc-2c963f66afa6",
                 "type": "text_generation",
@@ -90,4 +94,5 @@ class TaskStatusResponse(BaseModel):
                 },
                 "result": "Quantum computing is..."
             }
-        }
+        },
+    )
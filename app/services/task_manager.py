@@ -1,22 +1,76 @@
 import asyncio
+import itertools
 import uuid
 import time
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
 from typing import Dict, List, Any, Optional
 
+import orjson
+
 from app.core.logging import get_logger
 from app.core.config import get_settings
 
 logger = get_logger(__name__)
 settings = get_settings()
 
+try:
+    # UUIDv7 embeds a millisecond timestamp in the high bits, so ids sort
+    # by creation time and generation avoids a urandom syscall per task
+    from uuid_utils import uuid7
+
+    def _new_task_id() -> str:
+        return str(uuid7())
+except ImportError:
+    def _new_task_id() -> str:
+        return str(uuid.uuid4())
+
+
+@dataclass(slots=True)
+class Task:
+    """A tracked inference task; slots keep per-task overhead low"""
+    id: str
+    type: str
+    params: Dict
+    status: str
+    created_at: float
+    completed_at: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Build the dict shape the API layer ships to clients"""
+        return {
+            "id": self.id,
+            "type": self.type,
+            "params": self.params,
+            "status": self.status,
+            "created_at": self.created_at,
+            "completed_at": self.completed_at,
+        }
+
 
 class TaskManager:
     """Manages the lifecycle of inference tasks"""
     
     def __init__(self):
-        self.tasks: Dict[str, Dict[str, Any]] = {}
+        self.tasks: Dict[str, Task] = {}
         self.results: Dict[str, Any] = {}
-        self.lock = asyncio.Lock()
+        # Pre-serialized status payloads for finished tasks, so status
+        # polls can ship bytes without re-encoding JSON
+        self._status_bytes: Dict[str, bytes] = {}
+        # Index of task ids by status, in creation order, so list_tasks
+        # doesn't have to scan and filter every task per call
+        self._by_status: Dict[str, OrderedDict] = defaultdict(OrderedDict)
+        # Completion events so waiters get pushed the terminal status
+        # instead of polling for it
+        self.events: Dict[str, asyncio.Event] = {}
+        # Writes take a lock sharded by task id; none of the critical
+        # sections await, so reads can use plain dict access and writers
+        # for different tasks never contend on one global lock
+        self._locks = [asyncio.Lock() for _ in range(16)]
+
+    def _lock_for(self, task_id: str) -> asyncio.Lock:
+        """Return the write lock shard for a task id"""
+        return self._locks[hash(task_id) & 15]
     
     async def create_task(self, task_type: str, params: Dict) -> str:
         """
@@ -29,18 +83,20 @@ class TaskManager:
         Returns:
             Task ID
         """
-        task_id = str(uuid.uuid4())
+        task_id = _new_task_id()
         
-        async with self.lock:
-            self.tasks[task_id] = {
-                "id": task_id,
-                "type": task_type,
-                "params": params,
-                "status": "pending",
-                "created_at": time.time(),
-            }
+        async with self._lock_for(task_id):
+            self.tasks[task_id] = Task(
+                id=task_id,
+                type=task_type,
+                params=params,
+                status="pending",
+                created_at=time.time(),
+            )
+            self._by_status["pending"][task_id] = None
+            self.events[task_id] = asyncio.Event()
         
-        logger.info(f"Created task {task_id} of type {task_type}")
+        logger.debug("Created task %s of type %s", task_id, task_type)
         return task_id
     
     async def update_task_status(self, task_id: str, status: str, result: Optional[Any] = None) -> None:
@@ -55,18 +111,98 @@ class TaskManager:
         Raises:
             KeyError: If the task ID doesn't exist
         """
-        async with self.lock:
+        async with self._lock_for(task_id):
             if task_id not in self.tasks:
                 raise KeyError(f"Task {task_id} not found")
-            
-            self.tasks[task_id]["status"] = status
-            
+
+            task = self.tasks[task_id]
+            old_status = task.status
+            task.status = status
+            if old_status != status:
+                self._by_status[old_status].pop(task_id, None)
+                self._by_status[status][task_id] = None
+
             if result is not None:
                 self.results[task_id] = result
-                self.tasks[task_id]["completed_at"] = time.time()
-            
+                task.completed_at = time.time()
+
+                # Terminal results never change again, so serialize the full
+                # status payload once; coroutine or exotic results are skipped
+                # and serialized at the boundary as before
+                if status in ("completed", "failed"):
+                    try:
+                        payload = task.to_dict()
+                        payload["result"] = result
+                        self._status_bytes[task_id] = orjson.dumps(payload)
+                    except TypeError:
+                        self._status_bytes.pop(task_id, None)
+
+            # Wake anything blocked in wait_for once the task is terminal
+            if status in ("completed", "failed"):
+                event = self.events.get(task_id)
+                if event is not None:
+                    event.set()
+
             logger.debug(f"Updated task {task_id} status to {status}")
     
+    async def bulk_update_status(self, task_ids: List[str], status: str) -> None:
+        """
+        Move several tasks to the same status in one pass.
+
+        Groups the ids by lock shard so a dispatch burst pays one lock
+        acquisition per shard instead of one per task. Intended for
+        non-terminal transitions; results still go through
+        update_task_status individually.
+
+        Args:
+            task_ids: IDs of the tasks to update
+            status: New status for all of them
+        """
+        by_shard: Dict[int, List[str]] = defaultdict(list)
+        for task_id in task_ids:
+            by_shard[hash(task_id) & 15].append(task_id)
+
+        for shard, ids in by_shard.items():
+            async with self._locks[shard]:
+                for task_id in ids:
+                    task = self.tasks.get(task_id)
+                    if task is None:
+                        continue
+                    old_status = task.status
+                    task.status = status
+                    if old_status != status:
+                        self._by_status[old_status].pop(task_id, None)
+                        self._by_status[status][task_id] = None
+
+    async def wait_for(self, task_id: str, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until a task reaches a terminal status.
+
+        Args:
+            task_id: ID of the task
+            timeout: Maximum seconds to wait (None waits indefinitely)
+
+        Returns:
+            True if the task finished within the timeout, False otherwise
+
+        Raises:
+            KeyError: If the task ID doesn't exist
+        """
+        if task_id not in self.tasks:
+            raise KeyError(f"Task {task_id} not found")
+        event = self.events.get(task_id)
+
+        if event is None:
+            # Task predates event tracking or was already cleaned up;
+            # report its current (terminal) state
+            return True
+
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
     async def get_task_status(self, task_id: str) -> Dict:
         """
         Get the current status and info for a task.
@@ -80,15 +216,52 @@ class TaskManager:
         Raises:
             KeyError: If the task ID doesn't exist
         """
-        async with self.lock:
-            if task_id not in self.tasks:
-                raise KeyError(f"Task {task_id} not found")
-            
-            task_info = self.tasks[task_id].copy()
-            if task_info["status"] == "completed" and task_id in self.results:
-                task_info["result"] = self.results[task_id]
-            
-            return task_info
+        # Lock-free: dict reads are atomic on the event loop and nothing
+        # here awaits mid-read
+        if task_id not in self.tasks:
+            raise KeyError(f"Task {task_id} not found")
+
+        task_info = self.tasks[task_id].to_dict()
+        # Failed tasks store their error payload in results too; attach
+        # it so every status path reports the real failure
+        if task_info["status"] in ("completed", "failed") and task_id in self.results:
+            task_info["result"] = self.results[task_id]
+
+        return task_info
+
+    def get_task_state(self, task_id: str) -> str:
+        """
+        Get just the status string for a task.
+
+        Args:
+            task_id: ID of the task
+
+        Returns:
+            The task's current status (e.g. "pending", "completed")
+
+        Raises:
+            KeyError: If the task ID doesn't exist
+        """
+        # Lock-free single attribute read, cheap enough for every poll
+        return self.tasks[task_id].status
+
+    async def get_task_status_bytes(self, task_id: str) -> Optional[bytes]:
+        """
+        Get the pre-serialized status payload for a finished task.
+
+        Args:
+            task_id: ID of the task
+
+        Returns:
+            JSON bytes if the task finished and its result was serializable,
+            otherwise None
+
+        Raises:
+            KeyError: If the task ID doesn't exist
+        """
+        if task_id not in self.tasks:
+            raise KeyError(f"Task {task_id} not found")
+        return self._status_bytes.get(task_id)
 
     async def list_tasks(self, status: Optional[str] = None, limit: int = 100, skip: int = 0) -> List[Dict]:
         """
@@ -102,19 +275,16 @@ class TaskManager:
         Returns:
             List of task information dictionaries
         """
-        async with self.lock:
-            tasks = list(self.tasks.values())
-            
-            if status:
-                tasks = [task for task in tasks if task["status"] == status]
-            
-            # Sort by creation time (newest first)
-            tasks.sort(key=lambda x: x["created_at"], reverse=True)
-            
-            # Apply pagination
-            tasks = tasks[skip:skip+limit]
-            
-            return tasks
+        if status:
+            # The status index is kept in creation order, so newest-first
+            # is just a reversed walk — no scan or sort needed
+            task_ids = itertools.islice(
+                reversed(self._by_status[status]), skip, skip + limit
+            )
+            return [self.tasks[task_id].to_dict() for task_id in task_ids]
+
+        task_ids = itertools.islice(reversed(self.tasks), skip, skip + limit)
+        return [self.tasks[task_id].to_dict() for task_id in task_ids]
     
     async def clean_old_tasks(self, max_age_hours: Optional[int] = None) -> int:
         """
@@ -131,15 +301,23 @@ class TaskManager:
         max_age_seconds = max_age_hours * 3600
         
         removed_count = 0
-        async with self.lock:
-            to_remove = []
-            for task_id, task in self.tasks.items():
-                if current_time - task["created_at"] > max_age_seconds:
-                    to_remove.append(task_id)
-            
-            for task_id in to_remove:
-                self.tasks.pop(task_id, None)
+        # Tasks are inserted in creation order, so expired entries form a
+        # prefix of the dict: stop at the first one still young enough
+        # instead of scanning the whole table
+        to_remove = []
+        for task_id, task in self.tasks.items():
+            if current_time - task.created_at <= max_age_seconds:
+                break
+            to_remove.append(task_id)
+
+        for task_id in to_remove:
+            async with self._lock_for(task_id):
+                task = self.tasks.pop(task_id, None)
+                if task:
+                    self._by_status[task.status].pop(task_id, None)
                 self.results.pop(task_id, None)
+                self._status_bytes.pop(task_id, None)
+                self.events.pop(task_id, None)
                 removed_count += 1
         
         if removed_count > 0:
@@ -5,7 +5,6 @@ from app.core.logging import get_logger
 from app.core.config import get_settings
 from app.services.task_manager import TaskManager
 from app.llm.interface import LLMInterface
-from app.llm.models.factory import create_model, get_model, register_model
 
 logger = get_logger(__name__)
 settings = get_settings()
@@ -20,6 +19,12 @@ class TaskScheduler:
         self.running = False
         self.worker_task = None
         self.cleanup_task = None
+        # Scheduling is push-based: create_task callers enqueue here and
+        # the worker blocks on the queue instead of polling the manager
+        self.pending_queue: asyncio.Queue = asyncio.Queue()
+        # Cap concurrent model calls; more in flight than this just
+        # thrashes the GPU instead of finishing sooner
+        self.inference_semaphore = asyncio.Semaphore(settings.MAX_CONCURRENT_INFERENCE)
     
     async def start(self) -> None:
         """Start the task scheduler"""
@@ -74,7 +79,9 @@ class TaskScheduler:
             "model_name": model_name,
             "params": params or {}
         }
-        return await self.task_manager.create_task("text_generation", task_params)
+        task_id = await self.task_manager.create_task("text_generation", task_params)
+        await self.pending_queue.put((task_id, "text_generation", task_params))
+        return task_id
     
     async def schedule_chat_completion(
         self, messages: List[Dict], model_name: Optional[str] = None, params: Optional[Dict] = None
@@ -96,7 +103,9 @@ class TaskScheduler:
             "model_name": model_name,
             "params": params or {}
         }
-        return await self.task_manager.create_task("chat_completion", task_params)
+        task_id = await self.task_manager.create_task("chat_completion", task_params)
+        await self.pending_queue.put((task_id, "chat_completion", task_params))
+        return task_id
 
     async def stream_chat_completion(
         self, messages: List[Dict], model_name: Optional[str] = None, params: Optional[Dict] = None
@@ -116,23 +125,10 @@ class TaskScheduler:
         params = params or {}
 
         try:
-            # Get the model (load if necessary)
-            model = get_model(model_name)
-            if not model:
-                # Default to MLX model if not specified
-                model_path = params.get("model_path", model_name)
-                model = create_model("mlx", model_name, model_path)
-                register_model(model)
-                await model.load()
-            elif not model.is_loaded:
-                await model.load()
-
-            # Check if the model supports streaming
-            if not hasattr(model, "chat_stream"):
-                raise NotImplementedError(f"Model {model_name} does not support streaming")
-
-            # Call the model's chat_stream method
-            async for chunk in model.chat_stream(messages, params):
+            # Delegate to the interface layer: its load path runs blocking
+            # work off the event loop and holds the per-model lock, so two
+            # first-touch streams share one load instead of racing
+            async for chunk in self.llm.stream_chat_completion(messages, model_name, params):
                 yield chunk
         
         except Exception as e:
@@ -145,56 +141,90 @@ class TaskScheduler:
             }
 
     
-    async def _process_text_generation(self, task_id: str, params: Dict) -> None:
-        """Process a text generation task"""
+    async def _process_text_batch(self, tasks: List[Dict]) -> None:
+        """Process a batch of text generation tasks sharing model and params"""
+        first = tasks[0]["params"]
         try:
-            result = await self.llm.generate_text(
-                params["prompt"], 
-                params["model_name"], 
-                params.get("params", {})
-            )
-            await self.task_manager.update_task_status(task_id, "completed", result)
+            async with self.inference_semaphore:
+                results = await self.llm.batch_generate_text(
+                    [task["params"]["prompt"] for task in tasks],
+                    first["model_name"],
+                    first.get("params", {})
+                )
+            for task, result in zip(tasks, results):
+                await self.task_manager.update_task_status(task["id"], "completed", result)
         except Exception as e:
-            logger.error(f"Error processing text generation task {task_id}: {str(e)}")
-            await self.task_manager.update_task_status(task_id, "failed", {"error": str(e)})
-    
-    async def _process_chat_completion(self, task_id: str, params: Dict) -> None:
-        """Process a chat completion task"""
+            logger.error(f"Error processing text generation batch: {str(e)}")
+            for task in tasks:
+                await self.task_manager.update_task_status(task["id"], "failed", {"error": str(e)})
+
+    async def _process_chat_batch(self, tasks: List[Dict]) -> None:
+        """Process a batch of chat completion tasks sharing model and params"""
+        first = tasks[0]["params"]
         try:
-            result = await self.llm.chat_completion(
-                params["messages"], 
-                params["model_name"], 
-                params.get("params", {})
-            )
-            await self.task_manager.update_task_status(task_id, "completed", result)
+            async with self.inference_semaphore:
+                results = await self.llm.batch_chat_completion(
+                    [task["params"]["messages"] for task in tasks],
+                    first["model_name"],
+                    first.get("params", {})
+                )
+            for task, result in zip(tasks, results):
+                await self.task_manager.update_task_status(task["id"], "completed", result)
         except Exception as e:
-            logger.error(f"Error processing chat completion task {task_id}: {str(e)}")
-            await self.task_manager.update_task_status(task_id, "failed", {"error": str(e)})
-    
+            logger.error(f"Error processing chat completion batch: {str(e)}")
+            for task in tasks:
+                await self.task_manager.update_task_status(task["id"], "failed", {"error": str(e)})
+
     async def _task_worker(self) -> None:
-        """Worker that processes pending tasks"""
+        """Worker that processes queued tasks, batching compatible requests"""
         while self.running:
             try:
-                # Get pending tasks
-                pending_tasks = await self.task_manager.list_tasks(status="pending")
-                
-                # Process each pending task
-                for task in pending_tasks:
-                    task_id = task["id"]
-                    await self.task_manager.update_task_status(task_id, "processing")
-                    
-                    if task["type"] == "text_generation":
-                        asyncio.create_task(self._process_text_generation(task_id, task["params"]))
-                    elif task["type"] == "chat_completion":
-                        asyncio.create_task(self._process_chat_completion(task_id, task["params"]))
-                    else:
+                # Block until a task arrives, then hold a short window so
+                # near-simultaneous requests land in the same batch
+                items = [await self.pending_queue.get()]
+                deadline = asyncio.get_running_loop().time() + settings.BATCH_WINDOW_MS / 1000
+                while len(items) < settings.BATCH_MAX_SIZE:
+                    remaining = deadline - asyncio.get_running_loop().time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        items.append(
+                            await asyncio.wait_for(self.pending_queue.get(), remaining)
+                        )
+                    except asyncio.TimeoutError:
+                        break
+
+                # Mark the whole drain as processing in one lock pass
+                await self.task_manager.bulk_update_status(
+                    [task_id for task_id, _, _ in items], "processing"
+                )
+
+                # Group tasks that can share a single model call: same type,
+                # same model, same generation params
+                batches: Dict[tuple, List[Dict]] = {}
+                for task_id, task_type, task_params in items:
+                    if task_type not in ("text_generation", "chat_completion"):
                         await self.task_manager.update_task_status(
-                            task_id, "failed", {"error": f"Unknown task type: {task['type']}"}
+                            task_id, "failed", {"error": f"Unknown task type: {task_type}"}
                         )
-                
-                # Wait a bit before checking for new tasks
-                await asyncio.sleep(0.1)
-            
+                        continue
+
+                    key = (
+                        task_type,
+                        task_params["model_name"],
+                        repr(task_params.get("params", {}))
+                    )
+                    batches.setdefault(key, []).append({"id": task_id, "params": task_params})
+
+                # Dispatch each batch, splitting at the configured size cap
+                for (task_type, _, _), batch in batches.items():
+                    for i in range(0, len(batch), settings.BATCH_MAX_SIZE):
+                        group = batch[i:i + settings.BATCH_MAX_SIZE]
+                        if task_type == "text_generation":
+                            asyncio.create_task(self._process_text_batch(group))
+                        else:
+                            asyncio.create_task(self._process_chat_batch(group))
+
             except asyncio.CancelledError:
                 break
             except Exception as e:
@@ -3,7 +3,74 @@ import json
 import httpx
 import time
 import sys
-from typing import Dict, List, Any, Optional, Union
+from typing import AsyncGenerator, Dict, List, Any, Optional, Union
+
+try:
+    import orjson
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+
+    def _loads(data: bytes):
+        return orjson.loads(data)
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+
+    def _loads(data: bytes):
+        return json.loads(data)
+
+# Pre-built header dict for orjson-serialized request bodies
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# One process-wide HTTP client so every MLXInferenceClient (and any
+# script importing this module) multiplexes over the same connections.
+# Refcounted: close() on the last instance using it tears it down
+_shared_client: Optional["httpx.AsyncClient"] = None
+_shared_client_refs = 0
+
+
+def _build_http_client() -> "httpx.AsyncClient":
+    """Build a tuned AsyncClient: HTTP/2 when h2 is installed, plus a
+    keep-alive pool sized for submit + wait traffic"""
+    # Long total timeout for model loading, short connect timeout so a
+    # down server fails fast
+    timeout = httpx.Timeout(60.0, connect=5.0)
+    limits = httpx.Limits(
+        max_connections=100,
+        max_keepalive_connections=50,
+        keepalive_expiry=60,
+    )
+    try:
+        return httpx.AsyncClient(timeout=timeout, http2=True, limits=limits)
+    except ImportError:
+        return httpx.AsyncClient(timeout=timeout, limits=limits)
+
+
+def get_shared_client() -> "httpx.AsyncClient":
+    """Get the process-wide shared AsyncClient, creating it on first use"""
+    global _shared_client
+    if _shared_client is None or _shared_client.is_closed:
+        _shared_client = _build_http_client()
+    return _shared_client
+
+
+def _acquire_shared_client() -> "httpx.AsyncClient":
+    """Get the shared client, bumping its refcount"""
+    global _shared_client_refs
+    client = get_shared_client()
+    _shared_client_refs += 1
+    return client
+
+
+async def _release_shared_client() -> None:
+    """Drop one reference to the shared client, closing it on the last"""
+    global _shared_client, _shared_client_refs
+    if _shared_client_refs > 0:
+        _shared_client_refs -= 1
+    if _shared_client_refs == 0 and _shared_client is not None:
+        client, _shared_client = _shared_client, None
+        await client.aclose()
 
 
 class MLXInferenceClient:
@@ -14,25 +81,38 @@ class MLXInferenceClient:
     methods for text generation, chat completions, and model management.
     """
     
-    def __init__(self, base_url: str = "http://localhost:8000/api/v1"):
+    def __init__(
+        self,
+        base_url: str = "http://localhost:8000/api/v1",
+        client: Optional["httpx.AsyncClient"] = None,
+    ):
         """
         Initialize the client.
         
         Args:
             base_url: Base URL of the inference server API
+            client: Existing AsyncClient to reuse; by default the
+                process-wide shared client, so several MLXInferenceClient
+                instances multiplex over the same HTTP/2 connection
         """
         self.base_url = base_url.rstrip("/")
-        self.client = httpx.AsyncClient(timeout=60.0)  # Long timeout for model loading
+        # Instances given their own client own it; the shared default is
+        # refcounted so one instance closing doesn't break the others
+        self._owns_client = client is not None
+        self.client = client if client is not None else _acquire_shared_client()
     
     async def close(self):
-        """Close the HTTP client"""
-        await self.client.aclose()
+        """Close the HTTP client (the shared one closes with its last user)"""
+        if self._owns_client:
+            await self.client.aclose()
+        else:
+            await _release_shared_client()
     
     async def health_check(self) -> Dict:
         """Check if the API is healthy"""
         response = await self.client.get(f"{self.base_url}/health")
         response.raise_for_status()
-        return response.json()
+        return _loads(response.content)
     
     async def generate_text(
         self, 
@@ -64,10 +144,11 @@ class MLXInferenceClient:
         # Submit the generation request
         response = await self.client.post(
             f"{self.base_url}/text/generate",
-            json=request_data
+            content=_dumps(request_data),
+            headers=_JSON_HEADERS
         )
         response.raise_for_status()
-        data = response.json()
+        data = _loads(response.content)
         task_id = data["task_id"]
         
         if not wait_for_result:
@@ -106,10 +187,11 @@ class MLXInferenceClient:
         # Submit the chat completion request
         response = await self.client.post(
             f"{self.base_url}/chat/chat",
-            json=request_data
+            content=_dumps(request_data),
+            headers=_JSON_HEADERS
         )
         response.raise_for_status()
-        data = response.json()
+        data = _loads(response.content)
         task_id = data["task_id"]
         
         if not wait_for_result:
@@ -118,12 +200,68 @@ class MLXInferenceClient:
         # Poll for the result
         return await self._wait_for_task_result(task_id, poll_interval)
     
+    async def stream_chat_completion(
+        self,
+        messages: List[Dict],
+        model_name: Optional[str] = None,
+        params: Optional[Dict] = None
+    ) -> AsyncGenerator[Dict, None]:
+        """
+        Stream a chat completion, yielding chunks as they are generated.
+
+        Unlike chat_completion, the first token arrives as soon as the
+        model produces it instead of after the full generation.
+
+        Args:
+            messages: List of messages in the format [{"role": "...", "content": "..."}]
+            model_name: Name of the model to use (optional)
+            params: Additional generation parameters (optional)
+
+        Yields:
+            Parsed streaming chunks in the OpenAI chunk format
+        """
+        request_data = {"messages": messages}
+        if model_name:
+            request_data["model_name"] = model_name
+        if params:
+            request_data["params"] = params
+
+        async with self.client.stream(
+            "POST",
+            f"{self.base_url}/chat/chat/stream",
+            content=_dumps(request_data),
+            headers=_JSON_HEADERS
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                # SSE frames: only data lines carry payload
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+                parsed = _loads(data)
+                # Mid-stream failures arrive as an error frame with no
+                # choices; surface the server's message instead of
+                # handing callers a malformed chunk
+                if "error" in parsed:
+                    message = parsed["error"].get("message", "Unknown error")
+                    raise Exception(f"Streaming failed: {message}")
+                yield parsed
+
     async def _wait_for_task_result(self, task_id: str, poll_interval: float = 0.5):
-        """Poll for a task result until it's completed or failed"""
+        """Wait for a task result until it's completed or failed"""
         while True:
-            status_response = await self.client.get(f"{self.base_url}/tasks/{task_id}")
+            # The wait endpoint blocks server-side until the task finishes,
+            # so one round trip replaces a polling loop; if it times out we
+            # just ask again
+            status_response = await self.client.get(
+                f"{self.base_url}/tasks/{task_id}/wait",
+                params={"timeout": 30.0},
+                timeout=35.0
+            )
             status_response.raise_for_status()
-            status_data = status_response.json()
+            status_data = _loads(status_response.content)
             
             if status_data["status"] == "completed":
                 return status_data["result"]
@@ -131,14 +269,14 @@ class MLXInferenceClient:
                 error = status_data.get("result", {}).get("error", "Unknown error")
                 raise Exception(f"Task failed: {error}")
             
-            # Wait before polling again
+            # Not finished within the server-side window; wait again
             await asyncio.sleep(poll_interval)
     
     async def get_task_status(self, task_id: str) -> Dict:
         """Get the status of a specific task"""
         response = await self.client.get(f"{self.base_url}/tasks/{task_id}")
         response.raise_for_status()
-        return response.json()
+        return _loads(response.content)
     
     async def list_tasks(
         self, status: Optional[str] = None, limit: int = 100, skip: int = 0
@@ -152,13 +290,13 @@ class MLXInferenceClient:
         
         response = await self.client.get(f"{self.base_url}/tasks", params=params)
         response.raise_for_status()
-        return response.json()
+        return _loads(response.content)
     
     async def list_models(self) -> List[Dict]:
         """List all registered models and their status"""
         response = await self.client.get(f"{self.base_url}/models")
         response.raise_for_status()
-        return response.json()
+        return _loads(response.content)
     
     async def load_model(
         self, model_name: str, model_type: str = "mlx", model_path: Optional[str] = None
@@ -183,16 +321,17 @@ class MLXInferenceClient:
         
         response = await self.client.post(
             f"{self.base_url}/models/load",
-            json=request_data
+            content=_dumps(request_data),
+            headers=_JSON_HEADERS
         )
         response.raise_for_status()
-        return response.json()
+        return _loads(response.content)
     
     async def unload_model(self, model_name: str) -> Dict:
         """Unload a model from memory"""
         response = await self.client.post(f"{self.base_url}/models/unload/{model_name}")
         response.raise_for_status()
-        return response.json()
+        return _loads(response.content)
 
 
 async def main():
@@ -250,4 +389,11 @@ async def main():
 
 
 if __name__ == "__main__":
+    # uvloop drops event-loop overhead noticeably on poll-heavy clients;
+    # fall back to the stdlib loop where it isn't installed
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     asyncio.run(main())
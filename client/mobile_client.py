@@ -1,8 +1,167 @@
-import requests
+import asyncio
+import functools
+import hashlib
+import random
+import threading
 import time
 import json
+from collections import OrderedDict
+from concurrent.futures import Future
+from queue import SimpleQueue
 from typing import Dict, List, Any, Optional, Union
 
+import urllib3
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+
+    def _dumps_sorted(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+
+    def _loads(data: bytes):
+        return orjson.loads(data)
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+
+    def _dumps_sorted(obj) -> bytes:
+        return json.dumps(obj, sort_keys=True).encode()
+
+    def _loads(data: bytes):
+        return json.loads(data)
+
+
+# Results cached client-side for deterministic requests
+_RESULT_CACHE_MAX = 128
+
+# How long a cached list_models() response stays fresh
+_MODELS_CACHE_TTL = 60.0
+
+# Bodies above this size upload chunked instead of in one write
+_CHUNKED_UPLOAD_THRESHOLD = 64 * 1024
+_UPLOAD_CHUNK_SIZE = 16 * 1024
+
+
+def _iter_chunks(body: bytes):
+    """Yield an upload body in fixed-size chunks"""
+    for start in range(0, len(body), _UPLOAD_CHUNK_SIZE):
+        yield body[start:start + _UPLOAD_CHUNK_SIZE]
+
+
+class _IOWorker:
+    """
+    Single background thread that runs blocking HTTP calls.
+
+    UI frameworks like Kivy/Toga drop frames when network I/O runs on
+    the main thread. Work is enqueued as (callable, future) pairs; the
+    caller gets the Future immediately and polls future.done() per
+    frame, which is pure Python and never touches a socket.
+    """
+
+    def __init__(self):
+        self._queue: "SimpleQueue" = SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _ensure_thread(self) -> None:
+        """Start the worker thread on first use"""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._loop, daemon=True, name="mlx-client-io"
+                )
+                self._thread.start()
+
+    def _loop(self) -> None:
+        while True:
+            fn, future = self._queue.get()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn())
+            except BaseException as e:
+                future.set_exception(e)
+
+    def submit(self, fn) -> Future:
+        """Enqueue a callable; returns a Future resolved by the worker"""
+        self._ensure_thread()
+        future: Future = Future()
+        self._queue.put((fn, future))
+        return future
+
+
+# One worker for the process: urllib3's pools are thread-safe, but a
+# single I/O thread keeps ordering predictable and FD use flat
+_IO_WORKER = _IOWorker()
+
+
+# One pool per base_url shared by every client in the process, so a
+# second view or tab reuses warm keep-alive connections instead of
+# opening its own pool. Refcounted: the last close() tears it down.
+_POOLS: Dict[str, urllib3.PoolManager] = {}
+_POOL_REFS: Dict[str, int] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def _build_pool() -> urllib3.PoolManager:
+    """Build a tuned urllib3 pool for talking to the server"""
+    # Advertise brotli only when a decoder is installed; urllib3 ships
+    # the body undecoded otherwise
+    try:
+        import brotli  # noqa: F401
+        accept_encoding = "gzip, br"
+    except ImportError:
+        accept_encoding = "gzip"
+
+    # Keep-alive comes free with HTTP/1.1 pooling; the retry policy
+    # absorbs transient gateway errors on flaky links. The long read
+    # timeout covers model loading
+    return urllib3.PoolManager(
+        num_pools=2,
+        maxsize=16,
+        timeout=urllib3.Timeout(connect=5.0, read=60.0),
+        retries=Retry(
+            total=3,
+            backoff_factor=0.2,
+            status_forcelist=[502, 503, 504],
+        ),
+        headers={"Accept-Encoding": accept_encoding},
+    )
+
+
+def _acquire_pool(base_url: str) -> urllib3.PoolManager:
+    """Get the shared pool for a base_url, bumping its refcount"""
+    with _POOLS_LOCK:
+        pool = _POOLS.get(base_url)
+        if pool is None:
+            pool = _build_pool()
+            _POOLS[base_url] = pool
+        _POOL_REFS[base_url] = _POOL_REFS.get(base_url, 0) + 1
+        return pool
+
+
+def _release_pool(base_url: str) -> None:
+    """Drop one reference to a shared pool, closing it on the last"""
+    with _POOLS_LOCK:
+        refs = _POOL_REFS.get(base_url, 0) - 1
+        if refs > 0:
+            _POOL_REFS[base_url] = refs
+            return
+        _POOL_REFS.pop(base_url, None)
+        pool = _POOLS.pop(base_url, None)
+    if pool is not None:
+        pool.clear()
+
+
+def _check_status(response, url: str) -> None:
+    """Raise on error statuses (urllib3 doesn't by itself)"""
+    if response.status >= 400:
+        raise urllib3.exceptions.HTTPError(f"HTTP {response.status} for {url}")
+
 
 class MLXMobileClient:
     """
@@ -22,18 +181,78 @@ class MLXMobileClient:
             base_url: Base URL of the inference server API
         """
         self.base_url = base_url.rstrip("/")
-        self.session = requests.Session()
-        self.session.timeout = 60.0  # Long timeout for model loading
+        # Shared per-base_url pool: a second client (another view or
+        # tab) rides the same warm connections
+        self.http = _acquire_pool(self.base_url)
+        self._closed = False
+        # Reused for every orjson-serialized POST body; per-request
+        # headers replace the pool defaults, so fold those in
+        self._json_headers = {**self.http.headers, "Content-Type": "application/json"}
+        # LRU of results for deterministic (temperature=0) requests, so UI
+        # retries and back-navigation skip the server entirely
+        self._result_cache: "OrderedDict[bytes, Any]" = OrderedDict()
+        # (timestamp, value) for the short-TTL list_models cache
+        self._models_cache: Optional[tuple] = None
     
     def close(self):
-        """Close the HTTP session"""
-        self.session.close()
-    
+        """Release the shared HTTP pool (closed when the last client using it closes)"""
+        if not self._closed:
+            self._closed = True
+            _release_pool(self.base_url)
+
+    def _get_json(self, path: str, params: Optional[Dict] = None):
+        """GET a path and decode the JSON body, with a single status check"""
+        url = f"{self.base_url}{path}"
+        response = self.http.request("GET", url, fields=params)
+        _check_status(response, url)
+        return _loads(response.data)
+
+    def _post_json(self, path: str, payload: Dict):
+        """POST an orjson-serialized payload and decode the JSON response"""
+        url = f"{self.base_url}{path}"
+        body = _dumps(payload)
+        if len(body) > _CHUNKED_UPLOAD_THRESHOLD:
+            # Large bodies (long chat histories) go up chunked so the
+            # first bytes hit the wire before serialization of the whole
+            # request into socket buffers, smoothing weak uplinks
+            response = self.http.request(
+                "POST", url,
+                body=_iter_chunks(body),
+                headers=self._json_headers,
+                chunked=True
+            )
+        else:
+            response = self.http.request(
+                "POST", url, body=body, headers=self._json_headers
+            )
+        _check_status(response, url)
+        return _loads(response.data)
+
     def health_check(self) -> Dict:
         """Check if the API is healthy"""
-        response = self.session.get(f"{self.base_url}/health")
-        response.raise_for_status()
-        return response.json()
+        return self._get_json("/health")
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        """
+        Run any client call on the background I/O thread.
+
+        Args:
+            fn: Bound client method (or any callable) to run
+            *args: Positional arguments for the callable
+            **kwargs: Keyword arguments for the callable
+
+        Returns:
+            Future the UI can poll with done() and read with result()
+        """
+        return _IO_WORKER.submit(functools.partial(fn, *args, **kwargs))
+
+    def generate_text_future(self, prompt: str, **kwargs) -> Future:
+        """generate_text off the UI thread; resolves to the generated text"""
+        return self.submit(self.generate_text, prompt, **kwargs)
+
+    def chat_completion_future(self, messages: List[Dict], **kwargs) -> Future:
+        """chat_completion off the UI thread; resolves to the response dict"""
+        return self.submit(self.chat_completion, messages, **kwargs)
     
     def generate_text(
         self, 
@@ -61,24 +280,67 @@ class MLXMobileClient:
             request_data["model_name"] = model_name
         if params:
             request_data["params"] = params
-        
+
+        cache_key = self._cache_key(request_data, params) if wait_for_result else None
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
         # Submit the generation request
-        response = self.session.post(
-            f"{self.base_url}/text/generate",
-            json=request_data
-        )
-        response.raise_for_status()
-        data = response.json()
-        task_id = data["task_id"]
+        task_id = self._post_json("/text/generate", request_data)["task_id"]
         
         if not wait_for_result:
             return task_id
         
-        # Poll for the result
-        return self._wait_for_task_result(task_id, poll_interval)
+        # Wait for the result
+        result = self._wait_for_task_result(task_id, poll_interval)
+        self._cache_put(cache_key, result)
+        return result
     
+    def generate_text_batch(
+        self,
+        prompts: List[str],
+        model_name: Optional[str] = None,
+        params: Optional[Dict] = None,
+        wait_for_result: bool = True,
+        poll_interval: float = 0.5
+    ) -> Union[List[str], List[str]]:
+        """
+        Generate text for several prompts in one request.
+
+        All prompts go to the server in a single POST, so N submissions
+        cost one round trip instead of N, and the server's batching
+        window can group them for batched inference.
+
+        Args:
+            prompts: Input text prompts
+            model_name: Name of the model to use (optional)
+            params: Generation parameters shared by the batch (optional)
+            wait_for_result: Whether to wait for the results (True) or return task IDs (False)
+            poll_interval: Interval in seconds between polling for task status
+
+        Returns:
+            Generated texts in prompt order if wait_for_result is True,
+            otherwise the task IDs
+        """
+        items = []
+        for prompt in prompts:
+            item = {"prompt": prompt}
+            if model_name:
+                item["model_name"] = model_name
+            if params:
+                item["params"] = params
+            items.append(item)
+
+        task_ids = self._post_json("/text/generate/batch", {"items": items})["task_ids"]
+
+        if not wait_for_result:
+            return task_ids
+
+        return self._wait_for_task_results(task_ids, poll_interval)
+
     def chat_completion(
-        self, 
+        self,
         messages: List[Dict],
         model_name: Optional[str] = None,
         params: Optional[Dict] = None,
@@ -103,49 +365,202 @@ class MLXMobileClient:
             request_data["model_name"] = model_name
         if params:
             request_data["params"] = params
-        
+
+        cache_key = self._cache_key(request_data, params) if wait_for_result else None
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
         # Submit the chat completion request
-        response = self.session.post(
-            f"{self.base_url}/chat/chat",
-            json=request_data
-        )
-        response.raise_for_status()
-        data = response.json()
-        task_id = data["task_id"]
+        task_id = self._post_json("/chat/chat", request_data)["task_id"]
         
         if not wait_for_result:
             return task_id
         
-        # Poll for the result
-        return self._wait_for_task_result(task_id, poll_interval)
+        # Wait for the result
+        result = self._wait_for_task_result(task_id, poll_interval)
+        self._cache_put(cache_key, result)
+        return result
     
-    def _wait_for_task_result(self, task_id: str, poll_interval: float = 0.5):
-        """Poll for a task result until it's completed or failed"""
+    @staticmethod
+    def _cache_key(request_data: Dict, params: Optional[Dict]) -> Optional[bytes]:
+        """Cache key for a request, or None if the result isn't cacheable"""
+        # Only explicit temperature=0 requests are deterministic enough
+        # to replay from cache
+        if not params or params.get("temperature") != 0:
+            return None
+        return hashlib.blake2b(_dumps_sorted(request_data)).digest()
+
+    def _cache_get(self, key: Optional[bytes]):
+        if key is None:
+            return None
+        cached = self._result_cache.get(key)
+        if cached is not None:
+            self._result_cache.move_to_end(key)
+        return cached
+
+    def _cache_put(self, key: Optional[bytes], result) -> None:
+        if key is None:
+            return
+        self._result_cache[key] = result
+        while len(self._result_cache) > _RESULT_CACHE_MAX:
+            self._result_cache.popitem(last=False)
+
+    def stream_chat_completion(
+        self,
+        messages: List[Dict],
+        model_name: Optional[str] = None,
+        params: Optional[Dict] = None
+    ):
+        """
+        Stream a chat completion, yielding chunks as they are generated.
+
+        The first token reaches the UI as soon as the model produces it
+        instead of after the full generation, so perceived latency drops
+        from generation time to first-token time and no polling is
+        needed at all.
+
+        Args:
+            messages: List of messages in the format [{"role": "...", "content": "..."}]
+            model_name: Name of the model to use (optional)
+            params: Additional generation parameters (optional)
+
+        Yields:
+            Parsed streaming chunks in the OpenAI chunk format
+        """
+        request_data = {"messages": messages}
+        if model_name:
+            request_data["model_name"] = model_name
+        if params:
+            request_data["params"] = params
+
+        url = f"{self.base_url}/chat/chat/stream"
+        response = self.http.request(
+            "POST", url,
+            body=_dumps(request_data),
+            headers=self._json_headers,
+            preload_content=False
+        )
+        _check_status(response, url)
+        try:
+            # Reassemble SSE frames from the chunked body; only data
+            # lines carry payload
+            buffer = b""
+            for chunk in response.stream(1024):
+                buffer += chunk
+                while b"\n" in buffer:
+                    line, buffer = buffer.split(b"\n", 1)
+                    if not line.startswith(b"data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == b"[DONE]":
+                        return
+                    parsed = _loads(data)
+                    # Mid-stream failures arrive as an error frame with
+                    # no choices; surface the server's message instead
+                    # of handing callers a malformed chunk
+                    if "error" in parsed:
+                        message = parsed["error"].get("message", "Unknown error")
+                        raise Exception(f"Streaming failed: {message}")
+                    yield parsed
+        finally:
+            response.release_conn()
+
+    def _wait_for_task_result(self, task_id: str, poll_interval: float = 0.05):
+        """Wait for a task result until it's completed or failed"""
+        # Exponential backoff between rounds: short tasks are picked up
+        # almost immediately, long ones back off to a 2s cap, and jitter
+        # keeps many clients from polling in lockstep
+        delay = poll_interval
+        last_etag = None
         while True:
-            status_response = self.session.get(f"{self.base_url}/tasks/{task_id}")
-            status_response.raise_for_status()
-            status_data = status_response.json()
-            
+            # The wait query param makes the server hold the request until
+            # the task finishes (or the window closes), so one round trip
+            # replaces dozens of polls
+            url = f"{self.base_url}/tasks/{task_id}"
+            headers = dict(self.http.headers)
+            if last_etag:
+                headers["If-None-Match"] = last_etag
+            status_response = self.http.request(
+                "GET", url,
+                fields={"wait": 30},
+                headers=headers,
+                timeout=urllib3.Timeout(total=35)
+            )
+            # 304: status unchanged since the last poll, nothing to parse
+            if status_response.status == 304:
+                time.sleep(delay + random.uniform(0, delay * 0.1))
+                delay = min(2.0, delay * 2)
+                continue
+            _check_status(status_response, url)
+            last_etag = status_response.headers.get("ETag")
+            status_data = _loads(status_response.data)
+
             if status_data["status"] == "completed":
                 return status_data["result"]
             elif status_data["status"] == "failed":
                 error = status_data.get("result", {}).get("error", "Unknown error")
                 raise Exception(f"Task failed: {error}")
             
-            # Wait before polling again
-            time.sleep(poll_interval)
+            # Window closed with the task still running; back off before
+            # the next round
+            time.sleep(delay + random.uniform(0, delay * 0.1))
+            delay = min(2.0, delay * 2)
     
+    def _wait_for_task_results(self, task_ids: List[str], poll_interval: float = 0.5):
+        """Wait for several tasks, polling them all with one request per round"""
+        results: Dict[str, Any] = {}
+        delay = poll_interval
+        pending = list(task_ids)
+        while pending:
+            still_pending = []
+            for status_data in self.get_task_statuses(pending):
+                task_id = status_data["id"]
+                if status_data["status"] == "completed":
+                    results[task_id] = status_data["result"]
+                elif status_data["status"] == "failed":
+                    error = status_data.get("result", {}).get("error", "Unknown error")
+                    raise Exception(f"Task {task_id} failed: {error}")
+                else:
+                    still_pending.append(task_id)
+            pending = still_pending
+            if pending:
+                time.sleep(delay + random.uniform(0, delay * 0.1))
+                delay = min(2.0, delay * 2)
+
+        return [results[task_id] for task_id in task_ids]
+
     def get_task_status(self, task_id: str) -> Dict:
         """Get the status of a specific task"""
-        response = self.session.get(f"{self.base_url}/tasks/{task_id}")
-        response.raise_for_status()
-        return response.json()
-    
-    def list_models(self) -> List[Dict]:
-        """List all registered models and their status"""
-        response = self.session.get(f"{self.base_url}/models")
-        response.raise_for_status()
-        return response.json()
+        return self._get_json(f"/tasks/{task_id}")
+
+    def get_task_statuses(self, task_ids: List[str]) -> List[Dict]:
+        """Get the status of several tasks with a single request"""
+        return self._get_json("/tasks", params={"ids": ",".join(task_ids)})
+
+    def list_models(self, refresh: bool = False) -> List[Dict]:
+        """
+        List all registered models and their status.
+
+        The result rarely changes, so it's cached in-process for 60s;
+        startup and pull-to-refresh paths calling this repeatedly skip
+        the round trip. Pass refresh=True to bypass the cache (e.g.
+        right after loading a model).
+
+        Args:
+            refresh: Force a fetch even if a fresh cached value exists
+
+        Returns:
+            List of model information dictionaries
+        """
+        if not refresh and self._models_cache is not None:
+            cached_at, value = self._models_cache
+            if time.monotonic() - cached_at < _MODELS_CACHE_TTL:
+                return value
+
+        models = self._get_json("/models")
+        self._models_cache = (time.monotonic(), models)
+        return models
 
 
 class ChatView:
@@ -158,11 +573,30 @@ class ChatView:
     
     def __init__(self, server_url: str):
         """Initialize the chat view"""
+        self.server_url = server_url
         self.client = MLXMobileClient(server_url)
         self.chat_history = []
         self.system_message = {"role": "system", "content": "You are a helpful assistant."}
         self.is_generating = False
         self.current_task_id = None
+        # Rough token budget for the history sent per turn; chars/4 is
+        # close enough for window trimming without a tokenizer on-device
+        self.max_context_tokens = 2048
+        # Lazily-created async client plus the in-flight asyncio.Task,
+        # for apps that drive the view from an event loop instead of
+        # polling check_response on the UI thread
+        self._async_client = None
+        self.current_task: Optional[asyncio.Task] = None
+
+    def _get_async_client(self):
+        """Get (and lazily create) the async API client"""
+        if self._async_client is None:
+            try:
+                from client.async_client import MLXInferenceClient
+            except ImportError:
+                from async_client import MLXInferenceClient
+            self._async_client = MLXInferenceClient(self.server_url)
+        return self._async_client
     
     def add_user_message(self, message: str) -> None:
         """Add a user message to the chat history"""
@@ -172,9 +606,38 @@ class ChatView:
         """Add an assistant message to the chat history"""
         self.chat_history.append({"role": "assistant", "content": message})
     
+    def set_budget(self, max_context_tokens: int) -> None:
+        """Set the approximate token budget for history sent per turn"""
+        self.max_context_tokens = max_context_tokens
+
     def get_messages_for_api(self) -> List[Dict]:
-        """Get messages formatted for the API"""
-        return [self.system_message] + self.chat_history
+        """
+        Get messages formatted for the API, trimmed to the token budget.
+
+        Walks the history newest-first and keeps messages until the
+        budget (approximated as chars/4) runs out, so upload size and
+        server-side prompt processing stay bounded as the chat grows.
+        A short note stands in for whatever was dropped. The newest
+        message is always kept even if it alone exceeds the budget.
+        """
+        budget = self.max_context_tokens
+        window = []
+        for message in reversed(self.chat_history):
+            cost = len(message.get("content", "")) // 4 + 1
+            if window and budget - cost < 0:
+                break
+            budget -= cost
+            window.append(message)
+        window.reverse()
+
+        dropped = len(self.chat_history) - len(window)
+        if dropped:
+            note = {
+                "role": "system",
+                "content": f"[{dropped} earlier messages omitted to fit the context window]",
+            }
+            return [self.system_message, note] + window
+        return [self.system_message] + window
     
     def send_message(self, message: str) -> str:
         """
@@ -207,6 +670,92 @@ class ChatView:
             self.is_generating = False
             raise e
     
+    async def send_message_async(self, message: str) -> Optional[Dict]:
+        """
+        Send a user message and await the response without blocking the UI.
+
+        The long-poll happens inside the event loop (the server holds the
+        request until the task finishes), so no thread ever blocks on a
+        socket and frame time stays decoupled from network RTT.
+
+        Args:
+            message: User message to send
+
+        Returns:
+            The chat completion response, or a dict with an "error" key
+        """
+        if self.is_generating:
+            return None
+
+        self.add_user_message(message)
+        self.is_generating = True
+        try:
+            result = await self._get_async_client().chat_completion(
+                messages=self.get_messages_for_api()
+            )
+            content = result["choices"][0]["message"]["content"]
+            self.add_assistant_message(content)
+            return result
+        except Exception as e:
+            return {"error": str(e)}
+        finally:
+            self.is_generating = False
+
+    def start_message_task(self, message: str) -> Optional[asyncio.Task]:
+        """
+        Schedule send_message_async on the running loop.
+
+        The returned task is the async counterpart of the task-ID flow:
+        the UI polls task.done() each frame (cheap, no I/O) and reads
+        task.result() once it flips.
+
+        Args:
+            message: User message to send
+
+        Returns:
+            The in-flight asyncio.Task, or None if already generating
+        """
+        if self.is_generating:
+            return None
+        self.current_task = asyncio.get_running_loop().create_task(
+            self.send_message_async(message)
+        )
+        return self.current_task
+
+    def send_message_stream(self, message: str, on_delta=None) -> Optional[str]:
+        """
+        Send a user message and stream the reply as it's generated.
+
+        Deltas arrive token by token; on_delta (if given) is called with
+        each one so the UI can append to the live assistant bubble. The
+        full reply lands in the history once the stream ends.
+
+        Args:
+            message: User message to send
+            on_delta: Optional callback invoked with each text delta
+
+        Returns:
+            The complete assistant reply, or None if already generating
+        """
+        if self.is_generating:
+            return None
+
+        self.add_user_message(message)
+        self.is_generating = True
+        parts = []
+        try:
+            for chunk in self.client.stream_chat_completion(self.get_messages_for_api()):
+                delta = chunk["choices"][0].get("delta", {}).get("content")
+                if delta:
+                    parts.append(delta)
+                    if on_delta:
+                        on_delta(delta)
+            content = "".join(parts)
+            self.add_assistant_message(content)
+            return content
+        finally:
+            self.is_generating = False
+
     def check_response(self) -> Dict:
         """
         Check if the response is ready.
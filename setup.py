@@ -11,15 +11,25 @@ setup(
         "pydantic>=2.0.0",
         "pydantic-settings>=2.0.0",
         "python-dotenv>=1.0.0",
-        "httpx>=0.24.0",
-        "requests>=2.28.0",
-        # MLX libraries are listed as optional dependencies
+        # MLX libraries and client HTTP stacks are optional dependencies
     ],
     extras_require={
         "mlx": [
             "mlx>=0.3.0",
             "mlx-lm>=0.0.3",
         ],
+        # The mobile client talks urllib3 directly to keep cold-start
+        # import time and memory down
+        "mobile": [
+            "urllib3>=2.0",
+            "orjson",
+        ],
+        # [http2] pulls in h2 so the async client can multiplex
+        # submit + poll traffic over one connection; [brotli] lets it
+        # accept br-compressed status polls
+        "async": [
+            "httpx[http2,brotli]>=0.24.0",
+        ],
         "dev": [
             "pytest>=7.3.1",
             "black>=23.3.0",